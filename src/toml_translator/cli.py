@@ -1,12 +1,20 @@
-import argparse
 import sys
-import tomllib
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .translator import poetry_to_uv, uv_to_poetry, dump_toml
+from .translator import poetry_to_uv, uv_to_poetry, dump_toml, load_toml
 
+if TYPE_CHECKING:
+    import argparse
+
+
+MODES = ("poetry2uv", "uv2poetry")
+
+
+def build_parser() -> "argparse.ArgumentParser":
+    # imported lazily: only --help and usage errors need argparse
+    import argparse
 
-def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="toml-translator",
         description="Translate pyproject.toml between Poetry and uv formats",
@@ -14,7 +22,7 @@ def build_parser() -> argparse.ArgumentParser:
 
     parser.add_argument(
         "mode",
-        choices=("poetry2uv", "uv2poetry"),
+        choices=MODES,
         help="Translation direction",
     )
 
@@ -28,24 +36,38 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def main(argv: list[str] | None = None) -> None:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    if argv is None:
+        argv = sys.argv[1:]
 
-    if not args.path.exists():
-        parser.error(f"File not found: {args.path}")
+    # fast path for the plain "<mode> <path>" call, without building the parser
+    if len(argv) == 2 and argv[0] in MODES and not argv[1].startswith("-"):
+        mode, path = argv[0], Path(argv[1])
+    else:
+        args = build_parser().parse_args(argv)
+        mode, path = args.mode, args.path
+
+    if not path.exists():
+        build_parser().error(f"File not found: {path}")
 
-    if not args.path.is_file():
-        parser.error(f"Not a file: {args.path}")
+    if not path.is_file():
+        build_parser().error(f"Not a file: {path}")
 
-    with args.path.open("rb") as f:
-        data = tomllib.load(f)
+    data = load_toml(path)
 
-    if args.mode == "poetry2uv":
+    if mode == "poetry2uv":
         result = poetry_to_uv(data)
     else:
         result = uv_to_poetry(data)
 
-    sys.stdout.write(dump_toml(result))
+    # TOML is UTF-8 by spec; bypass the text layer so the locale encoding
+    # doesn't matter and the output isn't re-encoded line by line.
+    # Text-only streams (e.g. redirect_stdout(io.StringIO())) have no buffer.
+    output = dump_toml(result)
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(output)
+    else:
+        buffer.write(output.encode("utf-8"))
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -16,14 +16,35 @@ import re
 import sys
 import tomllib
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 # -----------------------------
 # TOML minimal writer (no deps)
 # -----------------------------
 
+# basic-string escapes: control characters (U+0000-U+001F, U+007F) get \uXXXX,
+# except those with a short form
+_TOML_ESCAPE = str.maketrans({
+    **{chr(c): f"\\u{c:04X}" for c in (*range(0x20), 0x7F)},
+    "\\": "\\\\",
+    '"': '\\"',
+    "\b": "\\b",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\f": "\\f",
+    "\r": "\\r",
+})
+
+
 def _toml_escape(s: str) -> str:
+    # control characters are rare; only then pay for the full translate table.
+    # isprintable() is False for all of U+0000-U+001F and U+007F (and for a few other
+    # characters, which _TOML_ESCAPE leaves untouched)
+    if not s.isprintable():
+        return f'"{s.translate(_TOML_ESCAPE)}"'
     s = s.replace("\\", "\\\\").replace('"', '\\"')
     return f'"{s}"'
 
@@ -46,56 +67,60 @@ def _toml_value(x: Any) -> str:
         return "[" + ", ".join(_toml_value(v) for v in x) + "]"
     if isinstance(x, dict):
         # inline table
-        items = []
-        for k, v in x.items():
-            if v is None:
-                continue
-            items.append(f"{k} = {_toml_value(v)}")
-        return "{ " + ", ".join(items) + " }"
+        items = ", ".join(f"{k} = {_toml_value(v)}" for k, v in x.items() if v is not None)
+        return "{ " + items + " }"
     raise TypeError(f"Unsupported type for TOML serialization: {type(x)}")
 
 
-def dump_toml(data: Dict[str, Any]) -> str:
+def _emit_tables(data: Dict[str, Any]) -> Iterator[str]:
     """
-    Minimal TOML serializer:
-    - Writes top-level keys and tables
-    - Nested dicts become [a.b] sections
-    - Lists of primitives supported
-    - Dict values are emitted as tables (not arrays-of-tables)
+    Yields TOML fragments for `data`: each table's scalars first, then its nested
+    tables depth-first. Uses an explicit stack instead of recursion.
     """
-    lines: List[str] = []
+    started = False
+    stack: List[Tuple[List[str], Dict[str, Any]]] = [([], data)]
 
-    def emit_table(path: List[str], table: Dict[str, Any]) -> None:
-        # Write scalars first
-        scalar_items: List[Tuple[str, Any]] = []
-        nested_items: List[Tuple[str, Dict[str, Any]]] = []
+    while stack:
+        path, table = stack.pop()
 
+        if path:
+            # blank line between tables
+            if started:
+                yield "\n"
+            yield "["
+            yield ".".join(path)
+            yield "]\n"
+            started = True
+
+        # one pass: scalars are written right away, nested tables are deferred
+        nested_items: List[Tuple[str, Dict[str, Any]]] = []
         for k, v in table.items():
             if v is None:
                 continue
             if isinstance(v, dict):
                 nested_items.append((k, v))
-            else:
-                scalar_items.append((k, v))
-
-        if path:
-            lines.append(f"[{'.'.join(path)}]")
-
-        for k, v in scalar_items:
-            lines.append(f"{k} = {_toml_value(v)}")
+                continue
+            yield k
+            yield " = "
+            yield _toml_value(v)
+            yield "\n"
+            started = True
 
-        if scalar_items and nested_items:
-            lines.append("")
+        # reversed, so tables pop off the stack in their original order
+        for k, v in reversed(nested_items):
+            stack.append((path + [k], v))
 
-        for k, v in nested_items:
-            # blank line between nested tables
-            if lines and lines[-1] != "":
-                lines.append("")
-            emit_table(path + [k], v)
 
-    emit_table([], data)
-    # final newline
-    return "\n".join(lines).rstrip() + "\n"
+def dump_toml(data: Dict[str, Any]) -> str:
+    """
+    Minimal TOML serializer:
+    - Writes top-level keys and tables
+    - Nested dicts become [a.b] sections
+    - Lists of primitives supported
+    - Dict values are emitted as tables (not arrays-of-tables)
+    """
+    # an empty document is still terminated by a newline
+    return "".join(_emit_tables(data)) or "\n"
 
 
 # ---------------------------------------
@@ -104,6 +129,9 @@ def dump_toml(data: Dict[str, Any]) -> str:
 
 SEMVER_RE = re.compile(r"^\s*(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:[.-].*)?\s*$")
 
+# ">=3.11,<4" -> ">=3.11, <4" (also collapses any existing spacing around commas)
+COMMA_RE = re.compile(r"\s*,\s*")
+
 
 def _parse_semver(v: str) -> Optional[Tuple[int, int, int]]:
     m = SEMVER_RE.match(v)
@@ -115,6 +143,7 @@ def _parse_semver(v: str) -> Optional[Tuple[int, int, int]]:
     return major, minor, patch
 
 
+@lru_cache(maxsize=1024)
 def poetry_caret_to_pep440(v: str) -> Optional[str]:
     """
     ^1.2.3 -> >=1.2.3,<2.0.0
@@ -136,6 +165,7 @@ def poetry_caret_to_pep440(v: str) -> Optional[str]:
     return f">={major}.{minor}.{patch},<{upper[0]}.{upper[1]}.{upper[2]}"
 
 
+@lru_cache(maxsize=1024)
 def poetry_tilde_to_pep440(v: str) -> Optional[str]:
     """
     ~1.2.3 -> >=1.2.3,<1.3.0
@@ -156,6 +186,7 @@ def poetry_tilde_to_pep440(v: str) -> Optional[str]:
     return f">={major}.{minor}.{patch},<{upper[0]}.{upper[1]}.{upper[2]}"
 
 
+@lru_cache(maxsize=1024)
 def poetry_version_to_pep508(version: str) -> str:
     """
     Converts Poetry-ish version strings into something acceptable as PEP 440/508.
@@ -165,12 +196,16 @@ def poetry_version_to_pep508(version: str) -> str:
       - other strings kept as-is
     """
     s = version.strip()
-    if s in ("*", ""):
+    if not s or s == "*":
         return ""
-    if s.startswith("^"):
+    first = s[0]
+    # already a PEP 440 comparison (">=1.0", "==2", "!=3", "~=1.4"): nothing to convert
+    if first in "<>=!" or s.startswith("~="):
+        return s
+    if first == "^":
         conv = poetry_caret_to_pep440(s[1:])
         return conv or s
-    if s.startswith("~"):
+    if first == "~":
         conv = poetry_tilde_to_pep440(s[1:])
         return conv or s
     return s
@@ -180,31 +215,33 @@ def poetry_version_to_pep508(version: str) -> str:
 # Dependency parsing / formatting (PEP508)
 # ---------------------------------------
 
+def _format_pep508(name: str, extras: List[str], spec: str, marker: str, url: str) -> str:
+    """
+    Joins PEP 508 fields into "name[extras] @ url ; marker" or "name[extras] spec ; marker".
+    """
+    parts = [name]
+    if extras:
+        parts.append("[" + ",".join(extras) + "]")
+    if url:
+        parts += (" @ ", url)
+    elif spec:
+        parts += (" ", spec)
+    if marker:
+        parts += (" ; ", marker)
+    return "".join(parts)
+
+
 @dataclass
 class Pep508Dep:
     name: str
     spec: str = ""           # e.g. ">=1,<2"
-    extras: List[str] = None # e.g. ["socks"]
+    extras: Optional[List[str]] = None # e.g. ["socks"]
     marker: str = ""         # e.g. 'python_version < "3.12"'
     url: str = ""            # e.g. "git+https://...@rev" or "https://..."
     direct_ref: str = ""     # left for future
 
     def to_pep508(self) -> str:
-        extras = ""
-        if self.extras:
-            extras = "[" + ",".join(self.extras) + "]"
-        spec = ""
-        if self.spec:
-            # ensure commas are kept
-            spec = self.spec
-        marker = ""
-        if self.marker:
-            marker = f" ; {self.marker}"
-        if self.url:
-            return f"{self.name}{extras} @ {self.url}{marker}"
-        if spec:
-            return f"{self.name}{extras} {spec}{marker}".strip()
-        return f"{self.name}{extras}{marker}".strip()
+        return _format_pep508(self.name, self.extras or [], self.spec, self.marker, self.url)
 
 
 PEP508_SIMPLE_RE = re.compile(
@@ -215,21 +252,81 @@ PEP508_SIMPLE_RE = re.compile(
     r"(?:;\s*(.+))?\s*$"
 )
 
+_PEP508_NAME_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-")
 
-def parse_pep508_best_effort(s: str) -> Pep508Dep:
+
+def _split_pep508(s: str) -> Optional[Tuple[str, Tuple[str, ...], str, str, str]]:
     """
-    Very lightweight parser. Keeps markers/spec/url in rough form.
+    Linear scanner for the common PEP 508 shapes:
+      name[extras] @ url ; marker
+      name[extras] <spec> ; marker
+    Returns None for anything unusual, so the caller can fall back to PEP508_SIMPLE_RE.
     """
+    if "\n" in s:
+        return None
+    rest, sep, marker = s.partition(";")
+    marker = marker.strip()
+    if sep and not marker:
+        return None
+
+    i = 0
+    while i < len(rest) and rest[i] in _PEP508_NAME_CHARS:
+        i += 1
+    if not i:
+        return None
+    name = rest[:i]
+    rest = rest[i:].strip()
+
+    extras: Tuple[str, ...] = ()
+    if rest.startswith("["):
+        end = rest.find("]")
+        if end < 0:
+            return None
+        extras = tuple(e.strip() for e in rest[1:end].split(",") if e.strip())
+        rest = rest[end + 1:].strip()
+
+    url = ""
+    spec = ""
+    if rest.startswith("@"):
+        url = rest[1:].strip()
+        if not url:
+            return None
+    elif rest:
+        if rest[0] not in "<>=!~":
+            return None
+        spec = rest
+
+    return name, extras, url, spec, marker
+
+
+@lru_cache(maxsize=1024)
+def _parse_pep508_fields(s: str) -> Tuple[str, Tuple[str, ...], str, str, str]:
+    """
+    Cached core of parse_pep508_best_effort.
+    Returns an immutable (name, extras, url, spec, marker) tuple.
+    """
+    fields = _split_pep508(s.strip())
+    if fields is not None:
+        return fields
+
     m = PEP508_SIMPLE_RE.match(s.strip())
     if not m:
         # fallback: whole string treated as name (won't be valid, but we preserve)
-        return Pep508Dep(name=s.strip(), spec="")
+        return s.strip(), (), "", "", ""
     name = m.group(1)
-    extras = [e.strip() for e in (m.group(2) or "").split(",") if e.strip()] or []
+    extras = tuple(e.strip() for e in (m.group(2) or "").split(",") if e.strip())
     url = (m.group(3) or "").strip()
     spec = (m.group(4) or "").strip()
     marker = (m.group(5) or "").strip()
-    return Pep508Dep(name=name, extras=extras, url=url, spec=spec, marker=marker)
+    return name, extras, url, spec, marker
+
+
+def parse_pep508_best_effort(s: str) -> Pep508Dep:
+    """
+    Very lightweight parser. Keeps markers/spec/url in rough form.
+    """
+    name, extras, url, spec, marker = _parse_pep508_fields(s)
+    return Pep508Dep(name=name, extras=list(extras), url=url, spec=spec, marker=marker)
 
 
 # ---------------------------------------
@@ -247,56 +344,61 @@ def poetry_dep_to_pep508(name: str, val: Any) -> Optional[str]:
     if name.lower() == "python":
         return None
 
-    dep = Pep508Dep(name=name, extras=[])
-
     if isinstance(val, str):
         spec = poetry_version_to_pep508(val)
-        dep.spec = spec
-        return dep.to_pep508()
+        return _format_pep508(name, [], spec, "", "")
 
     if isinstance(val, dict):
         # extras
-        extras = val.get("extras")
-        if isinstance(extras, list):
-            dep.extras = [str(x) for x in extras]
+        extras: List[str] = []
+        raw_extras = val.get("extras")
+        if isinstance(raw_extras, list):
+            extras = [str(x) for x in raw_extras]
 
         # markers
+        marker = ""
         markers = val.get("markers") or val.get("marker")
         if isinstance(markers, str):
-            dep.marker = markers.strip()
+            marker = markers.strip()
 
         # version
+        spec = ""
         version = val.get("version")
         if isinstance(version, str):
-            dep.spec = poetry_version_to_pep508(version).strip()
+            spec = poetry_version_to_pep508(version).strip()
 
         # direct references
+        url = ""
         if "git" in val:
             git = str(val["git"]).strip()
             rev = val.get("rev") or val.get("tag") or val.get("branch")
             if rev:
-                dep.url = f"git+{git}@{str(rev).strip()}"
+                url = f"git+{git}@{str(rev).strip()}"
             else:
-                dep.url = f"git+{git}"
+                url = f"git+{git}"
         elif "url" in val:
-            dep.url = str(val["url"]).strip()
+            url = str(val["url"]).strip()
         elif "path" in val:
             # PEP508 local paths: name @ file:///abs or name @ ./rel (tools vary).
             # We'll keep relative path with "file:" to be explicit if possible.
             path = str(val["path"]).strip()
             if path.startswith(("/", "\\")) or re.match(r"^[A-Za-z]:\\", path):
-                dep.url = f"file://{path}"
+                url = f"file://{path}"
             else:
-                dep.url = f"file:{path}"
+                url = f"file:{path}"
 
         # If optional=true in Poetry, that's typically handled via extras;
         # we'll keep it as normal dep here and wire extras separately via tool.poetry.extras.
-        return dep.to_pep508()
+        return _format_pep508(name, extras, spec, marker, url)
 
     # unknown type
     return f"{name} {str(val)}"
 
 
+# "Name <email>" as used in tool.poetry.authors
+_AUTHOR_RE = re.compile(r"^\s*([^<]*?)\s*<\s*([^>]*?)\s*>\s*$")
+
+
 def poetry_to_uv(pyproject: Dict[str, Any]) -> Dict[str, Any]:
     tool = pyproject.get("tool", {})
     poetry = (tool or {}).get("poetry", {})
@@ -323,16 +425,16 @@ def poetry_to_uv(pyproject: Dict[str, Any]) -> Dict[str, Any]:
     # authors: Poetry uses list of "Name <mail>"
     authors = poetry.get("authors")
     if isinstance(authors, list):
-        project["authors"] = [{"name": a.split("<")[0].strip(), "email": a.split("<")[1].strip(" >")} if "<" in a and ">" in a else {"name": a} for a in authors]
+        project["authors"] = [{"name": m.group(1), "email": m.group(2)} if isinstance(a, str) and (m := _AUTHOR_RE.match(a)) else {"name": a} for a in authors]
 
     # requires-python from poetry.dependencies.python
     deps = poetry.get("dependencies", {})
     if isinstance(deps, dict):
         py_req = deps.get("python")
         if isinstance(py_req, str):
-            project["requires-python"] = poetry_version_to_pep508(py_req).replace(",", ", ")
+            project["requires-python"] = COMMA_RE.sub(", ", poetry_version_to_pep508(py_req))
         elif isinstance(py_req, dict) and isinstance(py_req.get("version"), str):
-            project["requires-python"] = poetry_version_to_pep508(py_req["version"]).replace(",", ", ")
+            project["requires-python"] = COMMA_RE.sub(", ", poetry_version_to_pep508(py_req["version"]))
 
     # project.urls from homepage/repository/documentation
     urls: Dict[str, Any] = {}
@@ -343,13 +445,12 @@ def poetry_to_uv(pyproject: Dict[str, Any]) -> Dict[str, Any]:
     if urls:
         project["urls"] = urls
 
-    # main dependencies
-    project_deps: List[str] = []
+    # main dependencies, rendered once and reused for extras below
+    rendered: Dict[str, Optional[str]] = {}
     if isinstance(deps, dict):
         for name, val in deps.items():
-            pep = poetry_dep_to_pep508(name, val)
-            if pep:
-                project_deps.append(pep)
+            rendered[name] = poetry_dep_to_pep508(name, val)
+    project_deps: List[str] = [pep for pep in rendered.values() if pep]
     if project_deps:
         project["dependencies"] = project_deps
 
@@ -366,9 +467,9 @@ def poetry_to_uv(pyproject: Dict[str, Any]) -> Dict[str, Any]:
             for depname in extra_list:
                 if not isinstance(depname, str):
                     continue
-                # look up in dependencies dict
-                if isinstance(deps, dict) and depname in deps:
-                    pep = poetry_dep_to_pep508(depname, deps[depname])
+                # look up in already rendered dependencies
+                if depname in rendered:
+                    pep = rendered[depname]
                     if pep:
                         resolved.append(pep)
                 else:
@@ -416,6 +517,26 @@ def pep508_to_poetry_dep(s: str) -> Tuple[str, Any]:
     Direct refs:
       -> ("pkg", {url="..."} or {git="..."} when possible)
     """
+    name, val = _pep508_to_poetry_frozen(s)
+    if type(val) is tuple:
+        # fresh dict/lists per call, so callers may mutate the result
+        return name, {k: list(v) if type(v) is tuple else v for k, v in val}
+    return name, val
+
+
+@lru_cache(maxsize=1024)
+def _pep508_to_poetry_frozen(s: str) -> Tuple[str, Any]:
+    """
+    Cached core of pep508_to_poetry_dep. A dict value is frozen into a tuple of
+    (key, value) pairs, with list values turned into tuples.
+    """
+    name, val = _pep508_to_poetry_convert(s)
+    if type(val) is dict:
+        return name, tuple((k, tuple(v) if type(v) is list else v) for k, v in val.items())
+    return name, val
+
+
+def _pep508_to_poetry_convert(s: str) -> Tuple[str, Any]:
     dep = parse_pep508_best_effort(s)
     name = dep.name
 
@@ -457,16 +578,16 @@ def pep508_to_poetry_dep(s: str) -> Tuple[str, Any]:
     if not dep.spec and not dep.marker and not dep.extras:
         return name, "*"
 
-    d: Dict[str, Any] = {}
+    d4: Dict[str, Any] = {}
     if dep.spec:
-        d["version"] = dep.spec
+        d4["version"] = dep.spec
     else:
-        d["version"] = "*"
+        d4["version"] = "*"
     if dep.extras:
-        d["extras"] = dep.extras
+        d4["extras"] = dep.extras
     if dep.marker:
-        d["markers"] = dep.marker
-    return name, d
+        d4["markers"] = dep.marker
+    return name, d4
 
 
 def uv_to_poetry(pyproject: Dict[str, Any]) -> Dict[str, Any]:
@@ -546,20 +667,17 @@ def uv_to_poetry(pyproject: Dict[str, Any]) -> Dict[str, Any]:
         for extra_name, dep_list in opt.items():
             if not isinstance(dep_list, list):
                 continue
-            dep_names: List[str] = []
-            for dep_str in dep_list:
-                if isinstance(dep_str, str):
-                    dep_names.append(parse_pep508_best_effort(dep_str).name)
+            # parse each string once; the names feed the extras table
+            parsed = [pep508_to_poetry_dep(dep_str) for dep_str in dep_list if isinstance(dep_str, str)]
+            dep_names: List[str] = [n for n, _ in parsed]
             if dep_names:
                 extras_table[str(extra_name)] = dep_names
 
             # also ensure those deps exist in main dependencies with version info
-            for dep_str in dep_list:
-                if isinstance(dep_str, str):
-                    n, v = pep508_to_poetry_dep(dep_str)
-                    # mark optional by keeping in deps; poetry extras references them
-                    if n not in poetry_deps:
-                        poetry_deps[n] = v
+            for n, v in parsed:
+                # mark optional by keeping in deps; poetry extras references them
+                if n not in poetry_deps:
+                    poetry_deps[n] = v
 
     if extras_table:
         poetry["extras"] = extras_table
@@ -597,8 +715,8 @@ def uv_to_poetry(pyproject: Dict[str, Any]) -> Dict[str, Any]:
 # ---------------------------------------
 
 def load_toml(path: str) -> Dict[str, Any]:
-    with open(path, "rb") as f:
-        return tomllib.load(f)
+    # read the whole file in one go; pyproject files are small
+    return tomllib.loads(Path(path).read_bytes().decode("utf-8"))
 
 
 def main(argv: List[str]) -> int:
@@ -1,19 +1,15 @@
+import json
 import re
 import sys
-import tomllib
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
-
-def load_toml(path: str) -> Dict[str, Any]:
-    with open(path, "rb") as f:
-        return tomllib.load(f)
+from .translator import COMMA_RE, load_toml
 
 
 def re_space_after_comma(s: str) -> str:
     # turn ",   " into ", "
-    parts = [p.strip() for p in s.split(",")]
-    return ", ".join(parts)
+    return COMMA_RE.sub(", ", s.strip())
 
 
 def normalize(obj):
@@ -23,20 +19,31 @@ def normalize(obj):
     - lists: sort if possible (strings/dicts), normalize items
     - strings: normalize requires-python commas spacing
     """
-    if isinstance(obj, dict):
-        return {k: normalize(v) for k, v in obj.items()}
-
-    if isinstance(obj, list):
-        items = [normalize(x) for x in obj]
-        if all(isinstance(x, str) for x in items):
-            return sorted(items)
-        if all(isinstance(x, dict) for x in items):
-            return sorted(items, key=lambda d: repr(sorted(d.items())))
-        return items
-
-    if isinstance(obj, str):
-        if "," in obj:
-            obj = re_space_after_comma(obj)
-        return obj
-
-    return obj
+    match obj:
+        case dict():
+            return {k: normalize(v) for k, v in obj.items()}
+
+        case list():
+            items = [normalize(x) for x in obj]
+            if all(isinstance(x, str) for x in items):
+                return sorted(items)
+            if all(isinstance(x, dict) for x in items):
+                return sorted(items, key=lambda d: repr(sorted(d.items())))
+            return items
+
+        case str() if "," in obj:
+            return re_space_after_comma(obj)
+
+        case _:
+            return obj
+
+
+def canonical_json(obj) -> bytes:
+    """
+    Key-sorted, compact UTF-8 JSON of `obj`, for a cheap bytes compare of normalized
+    structures. Equal bytes imply equal structures; the reverse can fail for numbers
+    that compare equal but serialize differently (1 vs 1.0, 0.0 vs -0.0).
+    Non-JSON types (e.g. TOML datetimes) raise TypeError.
+    """
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
@@ -1,7 +1,9 @@
+import tomllib
 import unittest
+from collections import OrderedDict
 from pathlib import Path
 
-from toml_translator.translator import poetry_to_uv
+from toml_translator.translator import poetry_to_uv, dump_toml
 from toml_translator.utils import load_toml, re_space_after_comma, normalize
 
 
@@ -128,6 +130,63 @@ class TestPoetryToUv(unittest.TestCase):
         self.assertTrue(any(d.startswith("mypkg_url @ https://files.example.com/mypkg-1.0.0.whl") for d in deps))
         self.assertTrue(any(d.startswith("mypkg_path @ file:./local_pkg") for d in deps))
 
+    def test_non_string_author_entry_is_tolerated(self):
+        data = {
+            "tool": {
+                "poetry": {
+                    "name": "demo",
+                    "version": "0.1.0",
+                    "authors": [
+                        "A <a@a.com>",
+                        {"name": "B", "email": "b@b.com"},
+                    ],
+                }
+            }
+        }
+
+        authors = poetry_to_uv(data)["project"]["authors"]
+
+        self.assertEqual(len(authors), 2)
+        self.assertEqual(authors[0], {"name": "A", "email": "a@a.com"})
+
+    def test_special_characters_survive_dump(self):
+        data = {
+            "tool": {
+                "poetry": {
+                    "name": "demo",
+                    "version": "0.1.0",
+                    "description": 'Line one\r\n\tsays "hi" from C:\\path\x00\x7f\f',
+                }
+            }
+        }
+
+        out = poetry_to_uv(data)
+        reparsed = tomllib.loads(dump_toml(out))
+
+        self.assertEqual(reparsed["project"]["description"], data["tool"]["poetry"]["description"])
+
+    def test_str_and_dict_subclasses_are_accepted(self):
+        class Version(str):
+            pass
+
+        data = {
+            "tool": {
+                "poetry": {
+                    "name": "demo",
+                    "version": "0.1.0",
+                    "dependencies": {
+                        "requests": Version("^2.31"),
+                        "rich": OrderedDict(version=">=13", markers='python_version >= "3.11"'),
+                    },
+                }
+            }
+        }
+
+        deps = poetry_to_uv(data)["project"]["dependencies"]
+
+        self.assertIn("requests >=2.31.0,<3.0.0", deps)
+        self.assertIn('rich >=13 ; python_version >= "3.11"', deps)
+
     def test_missing_tool_poetry_raises(self):
         data = {"project": {"name": "x"}}
         with self.assertRaises(ValueError):
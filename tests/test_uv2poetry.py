@@ -1,84 +1,110 @@
+import copy
 import unittest
 from pathlib import Path
 
 from toml_translator.translator import uv_to_poetry
-from toml_translator.utils import load_toml, re_space_after_comma, normalize
-
-
-class TestUvToPoetry(unittest.TestCase):
-    def test_basic_metadata_requires_python_and_deps(self):
-        data = {
-            "build-system": {
-                "requires": ["hatchling"],
-                "build-backend": "hatchling.build",
+from toml_translator.utils import load_toml, re_space_after_comma, normalize, canonical_json
+
+
+_ASSETS = Path(__file__).resolve().parent.parent / "assets/examples/"
+
+FIXTURES = {
+    "basic": {
+        "build-system": {
+            "requires": ["hatchling"],
+            "build-backend": "hatchling.build",
+        },
+        "project": {
+            "name": "demo",
+            "version": "1.2.3",
+            "description": "Demo",
+            "requires-python": ">=3.10",
+            "authors": [{"name": "Aleksei Fomenko", "email": "fomenko_ai@proton.me"}],
+            "urls": {
+                "Homepage": "https://example.com",
+                "Repository": "https://github.com/example/example-uv-project",
             },
-            "project": {
-                "name": "demo",
-                "version": "1.2.3",
-                "description": "Demo",
-                "requires-python": ">=3.10",
-                "authors": [{"name": "Aleksei Fomenko", "email": "fomenko_ai@proton.me"}],
-                "urls": {
-                    "Homepage": "https://example.com",
-                    "Repository": "https://github.com/example/example-uv-project",
-                },
-                "dependencies": [
-                    "requests>=2.31",
-                    'rich>=13 ; python_version >= "3.11"',
-                ],
+            "dependencies": [
+                "requests>=2.31",
+                'rich>=13 ; python_version >= "3.11"',
+            ],
+        },
+    },
+    "groups": {
+        "project": {
+            "name": "demo",
+            "version": "0.1.0",
+            "requires-python": ">=3.11",
+            "dependencies": ["requests>=2.0"],
+        },
+        "dependency-groups": {
+            "dev": [
+                "pytest>=8",
+                'mypy>=1.10 ; platform_system != "Windows"',
+            ],
+            "test": [
+                "hypothesis>=6"
+            ],
+        },
+    },
+    "extras": {
+        "project": {
+            "name": "demo",
+            "version": "0.1.0",
+            "requires-python": ">=3.11",
+            "dependencies": ["requests>=2.31"],
+            "optional-dependencies": {
+                "server": ["uvicorn>=0.30", "httptools>=0.6"],
             },
         }
+    },
+    "direct_refs": {
+        "project": {
+            "name": "demo",
+            "version": "0.1.0",
+            "requires-python": ">=3.11",
+            "dependencies": [
+                "mypkg_git @ git+https://github.com/org/repo.git@v1.2.3",
+                "mypkg_url @ https://files.example.com/mypkg-1.0.0.whl",
+                "mypkg_path @ file:./local_pkg",
+            ],
+        }
+    },
+}
+
+EXPECTED_BASIC = {
+    "build-system": {
+        "requires": ["hatchling"],
+        "build-backend": "hatchling.build",
+    },
+    "tool": {
+        "poetry": {
+            "name": "demo",
+            "version": "1.2.3",
+            "description": "Demo",
+            "authors": ["Aleksei Fomenko <fomenko_ai@proton.me>"],
+            "homepage": "https://example.com",
+            "repository": "https://github.com/example/example-uv-project",
+            "dependencies": {
+                "python": ">=3.10",
+                "requests": {"version": ">=2.31"},
+                "rich": {"version": ">=13", "markers": 'python_version >= "3.11"'},
+            },
+        }
+    },
+}
 
-        out = uv_to_poetry(data)
-
-        self.assertIn("tool", out)
-        self.assertIn("poetry", out["tool"])
-        poetry = out["tool"]["poetry"]
-
-        self.assertEqual(poetry["name"], "demo")
-        self.assertEqual(poetry["version"], "1.2.3")
-        self.assertEqual(poetry["description"], "Demo")
-
-        # authors dict -> string
-        self.assertEqual(poetry["authors"], ["Aleksei Fomenko <fomenko_ai@proton.me>"])
-
-        # urls back
-        self.assertEqual(poetry["homepage"], "https://example.com")
-        self.assertEqual(poetry["repository"], "https://github.com/example/example-uv-project")
-
-        # dependencies include python
-        deps = poetry["dependencies"]
-        self.assertEqual(deps["python"], ">=3.10")
-        self.assertIn("requests", deps)
-        self.assertIn("rich", deps)
 
-        # rich has markers in dict form
-        self.assertIsInstance(deps["rich"], dict)
-        self.assertIn("markers", deps["rich"])
+class TestUvToPoetry(unittest.TestCase):
+    def test_basic_metadata_requires_python_and_deps(self):
+        out = uv_to_poetry(copy.deepcopy(FIXTURES["basic"]))
 
-        # build-system preserved
-        self.assertEqual(out["build-system"]["build-backend"], "hatchling.build")
+        # metadata, authors dict -> string, urls back, python in dependencies,
+        # rich markers in dict form, build-system preserved
+        self.assertEqual(out, EXPECTED_BASIC)
 
     def test_dependency_groups_to_poetry_groups(self):
-        data = {
-            "project": {
-                "name": "demo",
-                "version": "0.1.0",
-                "requires-python": ">=3.11",
-                "dependencies": ["requests>=2.0"],
-            },
-            "dependency-groups": {
-                "dev": [
-                    "pytest>=8",
-                    'mypy>=1.10 ; platform_system != "Windows"',
-                ],
-                "test": [
-                    "hypothesis>=6"
-                ],
-            },
-        }
-
-        out = uv_to_poetry(data)
+        out = uv_to_poetry(copy.deepcopy(FIXTURES["groups"]))
         poetry = out["tool"]["poetry"]
 
         self.assertIn("group", poetry)
@@ -95,25 +121,13 @@ class TestUvToPoetry(unittest.TestCase):
         self.assertIn("hypothesis", testdeps)
 
     def test_optional_dependencies_to_poetry_extras(self):
-        data = {
-            "project": {
-                "name": "demo",
-                "version": "0.1.0",
-                "requires-python": ">=3.11",
-                "dependencies": ["requests>=2.31"],
-                "optional-dependencies": {
-                    "server": ["uvicorn>=0.30", "httptools>=0.6"],
-                },
-            }
-        }
-
-        out = uv_to_poetry(data)
+        out = uv_to_poetry(copy.deepcopy(FIXTURES["extras"]))
         poetry = out["tool"]["poetry"]
 
         # extras created with dependency names
         self.assertIn("extras", poetry)
         self.assertIn("server", poetry["extras"])
-        self.assertEqual(set(poetry["extras"]["server"]), {"uvicorn", "httptools"})
+        self.assertCountEqual(poetry["extras"]["server"], ("uvicorn", "httptools"))
 
         # optional deps also appear in dependencies (best-effort behavior in translator)
         deps = poetry["dependencies"]
@@ -121,20 +135,7 @@ class TestUvToPoetry(unittest.TestCase):
         self.assertIn("httptools", deps)
 
     def test_direct_refs_back_to_poetry(self):
-        data = {
-            "project": {
-                "name": "demo",
-                "version": "0.1.0",
-                "requires-python": ">=3.11",
-                "dependencies": [
-                    "mypkg_git @ git+https://github.com/org/repo.git@v1.2.3",
-                    "mypkg_url @ https://files.example.com/mypkg-1.0.0.whl",
-                    "mypkg_path @ file:./local_pkg",
-                ],
-            }
-        }
-
-        out = uv_to_poetry(data)
+        out = uv_to_poetry(copy.deepcopy(FIXTURES["direct_refs"]))
         deps = out["tool"]["poetry"]["dependencies"]
 
         self.assertIn("mypkg_git", deps)
@@ -155,17 +156,20 @@ class TestUvToPoetry(unittest.TestCase):
 
 
 class TestFileTranslationUvToPoetry(unittest.TestCase):
-    def test_uv_file_translates_to_expected_poetry_file(self):
-        base = Path(__file__).resolve().parent.parent / "assets/examples/"
-        uv_path = base / "pyproject.uv.toml"
-        poetry_expected_path = base / "out.poetry.toml"
+    @classmethod
+    def setUpClass(cls):
+        cls.uv_data = load_toml(_ASSETS / "pyproject.uv.toml")
+        cls.poetry_expected = load_toml(_ASSETS / "out.poetry.toml")
 
-        uv_data = load_toml(uv_path)
-        poetry_expected = load_toml(poetry_expected_path)
+    def test_uv_file_translates_to_expected_poetry_file(self):
+        uv_data = copy.deepcopy(self.uv_data)
 
         poetry_actual = uv_to_poetry(uv_data)
 
-        self.assertEqual(normalize(poetry_actual), normalize(poetry_expected))
+        actual, expected = normalize(poetry_actual), normalize(self.poetry_expected)
+        if canonical_json(actual) != canonical_json(expected):
+            # bytes differ: deep compare for a readable diff
+            self.assertEqual(actual, expected)
 
 
 if __name__ == "__main__":